@@ -0,0 +1,23 @@
+from config.settings import _env
+
+
+# Processor factories, each returns the parameters for its separator/layer.
+# Referenced by "module:function" path from config/processors.py and only
+# called for enabled aliases, so disabled ones never read their env vars.
+
+## SEPARATORS
+
+def local_model_separator() -> dict:
+    return {}
+
+
+## CLASSIFIERS
+
+def local_model_layer() -> dict:
+    return {
+        "job_cost": 5,
+        "weights_path": "models/local_model.pt",
+        "device": _env("LOCAL_MODEL_DEVICE", "cpu"),
+        "batch_size": 2,
+        "confidence_threshold": 0.75,
+    }
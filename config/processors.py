@@ -1,4 +1,14 @@
-import os
+import importlib
+from types import MappingProxyType
+
+from config.settings import _env, _env_float
+
+
+def _run_factory(path: str) -> dict:
+    """Import and call a "module:function" factory, only done for enabled aliases."""
+    mod_path, _, attr = path.partition(":")
+    return getattr(importlib.import_module(mod_path), attr)()
+
 
 ## SEPARATORS
 
@@ -6,63 +16,67 @@ ALL_INTENT_SEPARATORS = {
     "local_model": {
         "path": "intent_classifier.intent_separators.LocalModelIntentSeparator",
         "job_cost": 1,
-        "factory": lambda: {
-        },
+        "factory": "config.factory_registry:local_model_separator",
     }
 }
 
 # Comma-separated whitelist. Enable *all* if empty
-_ENABLED = {a.strip() for a in os.getenv("ENABLED_SEPARATORS", "").split(",") if a.strip()}
+_ENABLED = {a.strip() for a in _env("ENABLED_SEPARATORS", "").split(",") if a.strip()}
+# A typo would otherwise silently leave the separator out
+if _unknown := _ENABLED - ALL_INTENT_SEPARATORS.keys():
+    raise ValueError(f"Unknown ENABLED_SEPARATORS: {', '.join(sorted(_unknown))}")
 _selected_aliases = _ENABLED or ALL_INTENT_SEPARATORS.keys()
 
-# Build ordered list (preserve the declared order in ALL_INTENT_SEPARATORS)
-INTENT_SEPARATORS = [
-    {
+# Build ordered tuple (preserve the declared order in ALL_INTENT_SEPARATORS) + read-only alias lookup
+_SEPARATORS = {
+    alias: {
         "alias": alias,
         "path": spec["path"],
-        **spec["factory"](),          # factory runs only for enabled aliases
+        **_run_factory(spec["factory"]),  # factory runs only for enabled aliases
     }
     for alias, spec in ALL_INTENT_SEPARATORS.items()
     if alias in _selected_aliases
-]
+}
+INTENT_SEPARATORS = tuple(_SEPARATORS.values())
+INTENT_SEPARATORS_BY_ALIAS = MappingProxyType(_SEPARATORS)
 
 
 
 ## CLASSIFIERS
 
-DEFAULT_INTENT_CONFIDENCE_THRESHOLD = float(
-    os.getenv("SABER_DEFAULT_INTENT_CONFIDENCE_THRESHOLD", 0.80)
-)
+DEFAULT_INTENT_CONFIDENCE_THRESHOLD = _env_float("SABER_DEFAULT_INTENT_CONFIDENCE_THRESHOLD", 0.80)
 
 # Full canonical list of classification layers
 # Each layer is a dict with:
 # - key/alias: unique identifier for the layer
 # - path: import path to the layer class
-# - factory: callable that returns a dict of parameters for the layer, doesn't complain about missing env vars for unused layers
+# - factory: "module:function" path to a function returning a dict of parameters for the layer,
+#   resolved only for enabled layers so unused ones don't import anything or complain about missing env vars
+# - speculative (optional, from the factory): classify as soon as the layer's condition passes instead of
+#   after the higher priority layers failed, trades budget (it's spent either way) for latency
 ALL_CLASSIFICATION_LAYERS = {
     "local_model": {
         "path": "intent_classifier.intent_layers.LocalModelIntentLayer",
-        "factory": lambda: {
-            "job_cost": 5,
-            "weights_path": "models/local_model.pt",
-            "device": os.getenv("LOCAL_MODEL_DEVICE", "cpu"),
-            "batch_size": 2,
-            "confidence_threshold": 0.75,
-        },
+        "factory": "config.factory_registry:local_model_layer",
     }
 }
 
 # Comma-separated whitelist. Enable *all* if empty
-_ENABLED = {a.strip() for a in os.getenv("ENABLED_LAYERS", "").split(",") if a.strip()}
+_ENABLED = {a.strip() for a in _env("ENABLED_LAYERS", "").split(",") if a.strip()}
+# A typo would otherwise silently leave the layer out
+if _unknown := _ENABLED - ALL_CLASSIFICATION_LAYERS.keys():
+    raise ValueError(f"Unknown ENABLED_LAYERS: {', '.join(sorted(_unknown))}")
 _selected_aliases = _ENABLED or ALL_CLASSIFICATION_LAYERS.keys()
 
-# Build ordered list (preserve the declared order in ALL_CLASSIFICATION_LAYERS)
-CLASSIFICATION_LAYERS = [
-    {
+# Build ordered tuple (preserve the declared order in ALL_CLASSIFICATION_LAYERS) + read-only alias lookup
+_LAYERS = {
+    alias: {
         "alias": alias,
         "path": spec["path"],
-        **spec["factory"](),          # factory runs only for enabled aliases
+        **_run_factory(spec["factory"]),  # factory runs only for enabled aliases
     }
     for alias, spec in ALL_CLASSIFICATION_LAYERS.items()
     if alias in _selected_aliases
-]
\ No newline at end of file
+}
+CLASSIFICATION_LAYERS = tuple(_LAYERS.values())
+CLASSIFICATION_LAYERS_BY_ALIAS = MappingProxyType(_LAYERS)
\ No newline at end of file
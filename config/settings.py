@@ -1,38 +1,77 @@
 import os
+from functools import lru_cache
+
+
+# Each variable is read, and parsed, once no matter how many settings or factories ask for it
+@lru_cache(maxsize=None)
+def _env(key: str, default: str | None = None) -> str | None:
+    return os.environ.get(key, default)
+
+
+@lru_cache(maxsize=None)
+def _env_int(key: str, default: int) -> int:
+    return int(_env(key, default))
+
+
+@lru_cache(maxsize=None)
+def _env_float(key: str, default: float) -> float:
+    return float(_env(key, default))
+
 
 APP_NAME = "intent-classifier"
 APP_VERSION = "0.1.0"
 
-DEBUG = os.getenv("SABER_DEBUG", "false").lower() in ("true", "1", "yes")
+DEBUG = _env("SABER_DEBUG", "false").lower() in ("true", "1", "yes")
 
 # API settings
-API_HOST = os.getenv("SABER_API_HOST", "0.0.0.0")
-API_PORT = os.getenv("SABER_API_PORT", 8005)
-API_KEY = os.getenv("SABER_API_KEY")  # required
+API_HOST = _env("SABER_API_HOST", "0.0.0.0")
+API_PORT = _env_int("SABER_API_PORT", 8005)
+API_KEY = _env("SABER_API_KEY")  # required
+
+# Run every separator's and layer's on_startup when the app starts instead of on first use
+EAGER_LAYERS = _env("SABER_EAGER_LAYERS", "false").lower() in ("true", "1", "yes")
 
 # Database settings
-DATABASE_URL = os.getenv("SABER_DATABASE_URL", "sqlite:///./intent_classifier.db")
+DATABASE_URL = _env("SABER_DATABASE_URL", "sqlite:///./intent_classifier.db")
 
 # Queue settings
-QUEUE_TYPE = os.getenv("SABER_QUEUE_TYPE", "memory")  # Options: memory, redis
+QUEUE_TYPE = _env("SABER_QUEUE_TYPE", "memory")  # Options: memory, redis
+# Per queue type constructor kwargs
 QUEUE_SETTINGS = {
-    "default_ttl": 3600
+    "memory": {
+        # Max pending tasks before enqueueing waits for room, 0 for unbounded
+        "maxsize": _env_int("SABER_QUEUE_MAX_SIZE", 1000),
+    },
 }
+# Seconds an enqueue may wait for room in a full queue before the request is rejected
+ENQUEUE_TIMEOUT = _env_float("SABER_ENQUEUE_TIMEOUT", 5.0)
+
+# Content shorter than this is never split into segments
+MIN_SEGMENTABLE_LENGTH = _env_int("SABER_MIN_SEGMENTABLE_LENGTH", 16)
 
 # Result Store settings
-RESULT_STORE_TYPE = os.getenv(
+RESULT_STORE_TYPE = _env(
     "SABER_RESULT_STORE_TYPE", "memory"
 )  # Options: memory, redis
 
+# Seconds a finished task's result is kept
+RESULT_STORE_TTL = _env_int("SABER_RESULT_STORE_TTL", 180)
+
+# Per result store type constructor kwargs
 RESULT_STORE_SETTINGS = {
-    "default_ttl": 180
+    "memory": {
+        "default_ttl": RESULT_STORE_TTL,
+    },
+    "redis": {
+        "default_ttl": RESULT_STORE_TTL,
+    },
 }
 
 # Logging settings
-LOG_LEVEL = os.getenv("SABER_LOG_LEVEL", "INFO")
-LOG_FORMAT = os.getenv(
+LOG_LEVEL = _env("SABER_LOG_LEVEL", "INFO")
+LOG_FORMAT = _env(
     "SABER_LOG_FORMAT", "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 
 # Middleware settings
-ALLOWED_HOSTS = os.getenv("SABER_ALLOWED_HOSTS", "*").split(",")
+ALLOWED_HOSTS = _env("SABER_ALLOWED_HOSTS", "*").split(",")
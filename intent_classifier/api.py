@@ -1,47 +1,87 @@
 import asyncio
+import hmac
 import logging
-from contextlib import asynccontextmanager
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from contextlib import AsyncExitStack, asynccontextmanager
 import uuid
 from typing import Literal
 
-from fastapi import Depends, FastAPI, HTTPException, status
-from fastapi.security import APIKeyHeader
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
 import httpx
+import orjson
 
 
 from .queue_store import get_queue, QueueBackend
 from .result_store import get_result_store, ResultBackend
-from .utils import send_post_request
-from .conf import conf, processors
-from .logic import classify_segment, segment_text
+from .utils import create_http_client, send_post_request
+# Separators and layers are read through the module, importing them by name would instantiate
+# them as soon as this module is imported instead of when the app starts
+from . import conf as conf_module
+from .conf import conf, API_KEY, ENQUEUE_TIMEOUT, MIN_SEGMENTABLE_LENGTH
+from .logic import JobBudget, SegmentPrefix, classify_segment, segment_text, started_instance
 
 
 # --------------------------------------------------------------------------- #
 logger = logging.getLogger(conf.APP_NAME)
-logging.basicConfig(level=conf.LOG_LEVEL, format=conf.LOG_FORMAT)
-
-api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Compared as bytes so hmac.compare_digest can do it in constant time
+_API_KEY_BYTES = API_KEY.encode("utf-8") if API_KEY else None
+
+# Served without a key
+_PUBLIC_PATHS = frozenset({"/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json"})
+
+
+class APIKeyMiddleware:
+    """
+    ASGI middleware that aborts if the X-API-Key header is bad/missing.
+    Reads the raw header bytes, skipping FastAPI's dependency resolution on every request.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in _PUBLIC_PATHS:
+            return await self.app(scope, receive, send)
+
+        key = None
+        for name, value in scope["headers"]:
+            if name == b"x-api-key":
+                key = value
+                break
+
+        if (
+            key is None
+            or _API_KEY_BYTES is None
+            or not hmac.compare_digest(key, _API_KEY_BYTES)
+        ):
+            response = ORJSONResponse(
+                {"detail": "Invalid or missing API key"},
+                status_code=status.HTTP_401_UNAUTHORIZED,
+            )
+            return await response(scope, receive, send)
 
-def validate_api_key(key: str | None = Depends(api_key_header)) -> None:
-    """FastAPI dependency that aborts if the key is bad/missing."""
-    if key is None or key != conf.API_KEY:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or missing API key",
-        )
+        await self.app(scope, receive, send)
 
 
 task_queue: QueueBackend
 result_store: ResultBackend
+http_client: httpx.AsyncClient
+event_loop: asyncio.AbstractEventLoop
+callback_tasks: set[asyncio.Task] = set()
 
 
 # --------------------------------------------------------------------------- #
 # Task schema
 # --------------------------------------------------------------------------- #
 class TaskIn(BaseModel):
-    task_id: uuid.UUID = Field()
+    # Unknown fields are rejected, assignments are never revalidated (tasks aren't modified after parsing)
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=False, validate_assignment=False)
+
+    task_id: uuid.UUID = Field(frozen=True)
     job: Literal["classify"]
     content: str
     is_partial: bool = False
@@ -53,52 +93,140 @@ class TaskIn(BaseModel):
 # --------------------------------------------------------------------------- #
 # FastAPI
 # --------------------------------------------------------------------------- #
+def start_log_listener() -> QueueListener:
+    """
+    Route the app logger through a queue, its handlers then write from a listener thread
+    so a slow stream (or a burst of errors) never blocks the event loop.
+    """
+    log_queue = queue.SimpleQueue()
+    # The app logger's own handlers, or the root ones its records propagated to
+    handlers = logger.handlers or logging.getLogger().handlers
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+
+    logger.handlers = [QueueHandler(log_queue)]
+    # Records reach those handlers through the listener now, not through propagation
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info("Started lifespan context.")
+    # Left alone when the server (or a previous reload) already set up logging
+    if not logging.getLogger().handlers:
+        logging.basicConfig(level=conf.LOG_LEVEL, format=conf.LOG_FORMAT)
+    logger_state = (logger.handlers, logger.propagate)
+    log_listener = start_log_listener()
+
+    def stop_logging() -> None:
+        # Writes out whatever is still queued, then logging goes back to being synchronous
+        log_listener.stop()
+        logger.handlers, logger.propagate = logger_state
+
+    async def close_http_client(client: httpx.AsyncClient) -> None:
+        # Let in-flight callbacks finish before their client goes away
+        if callback_tasks:
+            await asyncio.gather(*callback_tasks, return_exceptions=True)
+        await client.aclose()
+
+    async def close_queue(queue: QueueBackend) -> None:
+        await queue.close()
+        logger.info("Stopped queue worker.")
 
-    global task_queue, result_store
-    
-    # Initialize queue based on settings
-    queue_settings = conf.QUEUE_SETTINGS.get(conf.QUEUE_TYPE, {})
-    task_queue = get_queue(conf.QUEUE_TYPE, **queue_settings)
+    # Everything set up below is undone in reverse order on shutdown,
+    # or as far as it got when startup fails (e.g. a layer's on_startup raising)
+    async with AsyncExitStack() as cleanup:
+        cleanup.callback(stop_logging)
+        logger.info("Started lifespan context.")
 
-    # Initialize result store based on settings
-    result_store_settings = conf.RESULT_STORE_SETTINGS.get(conf.RESULT_STORE_TYPE, {})
-    result_store = get_result_store(conf.RESULT_STORE_TYPE, **result_store_settings)
+        global task_queue, result_store, http_client, event_loop
 
-    asyncio.create_task(task_queue.worker(process_task))
+        # Resolved once, tasks only need it for timestamps
+        event_loop = asyncio.get_running_loop()
+        logger.info("Running on event loop: %s", type(event_loop).__module__)
 
-    logger.info("Started queue worker and result store.")
+        # Shared by all callbacks so connections are kept alive between tasks
+        http_client = create_http_client()
+        cleanup.push_async_callback(close_http_client, http_client)
 
-    for separator in processors.INTENT_SEPARATORS:
-        await separator["instance"].on_startup()
-        logger.info("Initialized intent separator: %s", separator["alias"])
+        # Initialize result store based on settings
+        result_store_settings = conf.RESULT_STORE_SETTINGS.get(conf.RESULT_STORE_TYPE, {})
+        result_store = get_result_store(conf.RESULT_STORE_TYPE, **result_store_settings)
 
+        # First access instantiates them, done here so the first task doesn't pay for it
+        logger.info(
+            "Loaded %d intent separator(s) and %d classification layer(s).",
+            len(conf_module.INTENT_SEPARATORS),
+            len(conf_module.CLASSIFICATION_LAYERS),
+        )
 
-    for layer in processors.CLASSIFICATION_LAYERS:
-        await layer["instance"].on_startup()
-        logger.info("Initialized classification layer: %s", layer["alias"])
+        # Initialize queue based on settings
+        queue_settings = conf.QUEUE_SETTINGS.get(conf.QUEUE_TYPE, {})
+        task_queue = get_queue(conf.QUEUE_TYPE, **queue_settings)
+        asyncio.create_task(task_queue.worker(process_task))
+        cleanup.push_async_callback(close_queue, task_queue)
 
+        logger.info("Started queue worker and result store.")
 
-    try:
-        yield
-    finally:
-        await task_queue.close()
-        logger.info("Stopped queue worker.")
+        async def start(kind: str, item: dict) -> None:
+            await started_instance(item)
+            logger.info("Initialized %s: %s", kind, item["alias"])
 
+        # Otherwise each separator and layer is started the first time a task needs it
+        if conf.EAGER_LAYERS:
+            # Separators and layers don't depend on each other, start them all at once
+            async with asyncio.TaskGroup() as tg:
+                for separator in conf_module.INTENT_SEPARATORS:
+                    tg.create_task(start("intent separator", separator))
+                for layer in conf_module.CLASSIFICATION_LAYERS:
+                    tg.create_task(start("classification layer", layer))
+
+        yield
 
-app = FastAPI(title=conf.APP_NAME, lifespan=lifespan)
 
+app = FastAPI(
+    title=conf.APP_NAME,
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(APIKeyMiddleware)
+
+
+@app.post(
+    "/queue/",
+    status_code=202,
+    # Plain dict of strings, nothing to validate on the way out
+    response_model=None,
+    # Body is parsed by hand below, so describe it for the docs here
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": TaskIn.model_json_schema()}},
+            "required": True,
+        }
+    },
+)
+async def enqueue_task(request: Request) -> dict[str, str]:
+    # Validate straight from the raw bytes, skips building an intermediate dict
+    try:
+        task = TaskIn.model_validate_json(await request.body())
+    except ValidationError as e:
+        # Located under "body" like FastAPI's own body validation reports them
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
 
-@app.post("/queue/", dependencies=[Depends(validate_api_key)], status_code=202)
-async def enqueue_task(task: TaskIn) -> dict[str, str]:
-    await task_queue.enqueue(task)
+    try:
+        await asyncio.wait_for(task_queue.enqueue(task), timeout=ENQUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Task queue is full, try again later",
+        )
     return {"status": "queued", "task_id": str(task.task_id)}
 
 
-@app.get("/result/{task_id}", dependencies=[Depends(validate_api_key)])
-async def get_task_result(task_id: uuid.UUID) -> dict:
+@app.get("/result/{task_id}")
+async def get_task_result(task_id: uuid.UUID) -> Response:
     """Get the result of a completed task."""
     result = await result_store.get_result(task_id)
 
@@ -108,52 +236,103 @@ async def get_task_result(task_id: uuid.UUID) -> dict:
             detail=f"Result for task {task_id} not found or expired",
         )
 
-    return result
+    # Already encoded JSON, sent as is
+    return Response(content=result, media_type="application/json")
 
 
-async def process_task(task: TaskIn) -> None:
+async def process_task(task: TaskIn | dict) -> None:
+    # Queues that serialize their items (redis) hand back plain dicts
+    if isinstance(task, dict):
+        task = TaskIn.model_validate(task)
+
+    # Bound once, read again for every segment and log line below
+    task_id = task.task_id
+    content = task.content
+    is_partial = task.is_partial
+
     task_result = {
-        "task_id": str(task.task_id),
+        "task_id": str(task_id),
         "status": "processing",
-        "timestamp": asyncio.get_event_loop().time(),
-        "is_partial": task.is_partial,
+        "timestamp": event_loop.time(),
+        "is_partial": is_partial,
     }
     
-    logger.info(
-        "Processing task %r",
-        task
-    )
+    # Checked once per task, the per-segment logs below are skipped entirely when disabled
+    log_info = logger.isEnabledFor(logging.INFO)
+    log_debug = logger.isEnabledFor(logging.DEBUG)
 
-    try:
-        # Find out how many intents to classify and their borders
-        segments = await segment_text(processors.INTENT_SEPARATORS, task.content)
+    if log_info:
+        logger.info("Processing task %s", task_id)
+    if log_debug:
+        logger.debug("Task details: %r", task)
 
+    try:
+        # Find out how many intents to classify and their borders,
+        # content too short to hold more than one is used as is
+        if len(content) < MIN_SEGMENTABLE_LENGTH:
+            segments = [content]
+        else:
+            segments = await segment_text(conf_module.INTENT_SEPARATORS, content)
+
+        # Layers costing more than the whole job budget can never run, drop them once per task
+        layers = [
+            layer
+            for layer in conf_module.LAYERS_BY_ORDER[task.priority_order]
+            if layer["cost"] <= task.job_budget
+        ]
         # Run segments through classification layers
-        layers = (
-            processors.CLASSIFICATION_LAYERS
-            if task.priority_order == "ascending"
-            else reversed(processors.CLASSIFICATION_LAYERS)
+        budget = JobBudget(
+            task.job_budget,
+            segments=len(segments),
+            worst_case=len(segments) * sum(layer["cost"] for layer in layers),
         )
-        running_cost = 0
         classification_results = []
+        failed_segments = 0
+
+        # Segments are independent from each other, so classify them concurrently
+        if log_info:
+            logger.info("Processing %d segment(s)", len(segments))
+        # Every segment sees the ones before it through a view of this tuple
+        all_segments = tuple(segments)
+        results = await asyncio.gather(
+            *(
+                classify_segment(
+                    SegmentPrefix(all_segments, i),
+                    segment,
+                    layers,
+                    budget,
+                    is_partial=is_partial,
+                    index=i,
+                )
+                for i, segment in enumerate(segments)
+            ),
+            return_exceptions=True,
+        )
+        if log_debug:
+            logger.debug("Total running cost: %d", budget.spent)
 
-        for i in range(len(segments)):
-            segment = segments[i]
-            logger.info("Processing segment %d/%d: %r", i + 1, len(segments), segment)
-            logger.debug("Current running cost: %d", running_cost)
-
-            running_cost, result = await classify_segment(
-                task,
-                segments[:i],
-                segment,
-                layers,
-                running_cost=running_cost,
-                is_partial=task.is_partial,
-            )
-            logger.debug("Segment %d result: %r, updated running cost: %d", i + 1, result, running_cost)
+        for i, (segment, result) in enumerate(zip(segments, results), 1):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Error classifying segment %d: %s", i, result, exc_info=result
+                )
+                # Reported with the segment, so a failure isn't mistaken for "no intent found"
+                classification_results.append(
+                    {
+                        "segment": segment,
+                        "error": str(result),
+                    }
+                )
+                failed_segments += 1
+                continue
             if result is None:
-                logger.info("No classification result for segment %d", i + 1)
+                if log_info:
+                    logger.info("No classification result for segment %d", i)
                 continue
+            if log_debug:
+                logger.debug(
+                    "Segment %d/%d intent: %s", i, len(segments), result.get("intent")
+                )
 
             classification_results.append(
                 {
@@ -162,34 +341,56 @@ async def process_task(task: TaskIn) -> None:
                 }
             )
 
-        task_result["status"] = "completed"
+        # Nothing could be classified at all, the task failed even though no single step raised
+        if failed_segments == len(segments):
+            task_result["status"] = "failed"
+            task_result["error"] = classification_results[0]["error"]
+        else:
+            task_result["status"] = "completed"
         task_result["results"] = classification_results
-        logger.debug("Task completed with results: %r", classification_results)
+        if log_debug:
+            logger.debug("Task completed with %d result(s)", len(classification_results))
 
     # Incase of any error, store the error result
     except Exception as e:
-        logger.exception("Error processing task %s", task.task_id)
+        logger.exception("Error processing task %s", task_id)
         task_result["status"] = "failed"
         task_result["error"] = str(e)
         logger.debug("Task failed with error: %s", str(e))
 
     finally:
-        # Store the result in the result store
-        logger.debug("Storing result for task %s: %r", task.task_id, task_result)
-        await result_store.store_result(task.task_id, task_result)
-        logger.info("Finished task %s and stored result", task.task_id)
+        # Encoded once, the same bytes go to the callback and the result store
+        payload = orjson.dumps(task_result, default=str)
 
         # Let callback url know that its done if provided (failed or succeeded both)
+        # Sent in the background so a slow receiver doesn't hold up the queue worker,
+        # started first so the POST overlaps with the result store write below
         if task.callback_url:
-            logger.info("Sending result to callback URL: %s", task.callback_url)
-            try:
-                await send_post_request(task.callback_url, task_result)
-                logger.debug("Callback POST succeeded for URL: %s", task.callback_url)
-            except httpx.RequestError as e:
-                logger.exception("An error occurred while requesting: %s", e)
-            except httpx.HTTPStatusError as e:
-                logger.exception(
-                    "Callback URL returned status %s", e.response.status_code
-                )
-            except Exception as e:
-                logger.exception("Callback POST failed: %s", e)
+            callback = asyncio.create_task(
+                send_callback(task.callback_url, payload)
+            )
+            # Keep a reference so the task isn't garbage collected mid-flight
+            callback_tasks.add(callback)
+            callback.add_done_callback(callback_tasks.discard)
+
+        # Store the result in the result store
+        if log_debug:
+            logger.debug("Storing result for task %s (%d bytes)", task_id, len(payload))
+        await result_store.store_result(task_id, payload)
+        if log_info:
+            logger.info("Finished task %s and stored result", task_id)
+
+
+async def send_callback(url: str, payload: bytes) -> None:
+    logger.info("Sending result to callback URL: %s", url)
+    try:
+        await send_post_request(http_client, url, payload)
+        logger.debug("Callback POST succeeded for URL: %s", url)
+    except httpx.RequestError as e:
+        logger.exception("An error occurred while requesting: %s", e)
+    except httpx.HTTPStatusError as e:
+        logger.exception(
+            "Callback URL returned status %s", e.response.status_code
+        )
+    except Exception as e:
+        logger.exception("Callback POST failed: %s", e)
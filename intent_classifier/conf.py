@@ -1,29 +1,97 @@
 import os
+from dataclasses import make_dataclass
 from pathlib import Path
-from types import SimpleNamespace
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-from .utils import load_module, load_class
+from .utils import env_files, get_environment, load_module, load_class
 
-ENVIRONMENT = (
-    os.getenv("SABER_ENVIRONMENT")
-    or os.getenv("ENVIRONMENT")
-    or os.getenv("ENV")
-    or "development"
-).lower()
+ENVIRONMENT = get_environment()
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-for env_file in (BASE_DIR / "envs" / f"{ENVIRONMENT}.env", BASE_DIR / ".env"):
-    if env_file.exists():
+# Worker and reload processes inherit the environment with the loaded values in it,
+# so only the first process reads and parses the files
+if not os.environ.get("_SABER_DOTENV_LOADED"):
+    # Missing files are skipped by load_dotenv itself, no separate exists() stat
+    for env_file in env_files(BASE_DIR, ENVIRONMENT):
         load_dotenv(env_file, override=False)
+    os.environ["_SABER_DOTENV_LOADED"] = "1"
 
-conf = SimpleNamespace(**load_module("config.settings"))
-processors = SimpleNamespace(**load_module("config.processors"))
 
-for k in ["INTENT_SEPARATORS", "CLASSIFICATION_LAYERS"]:
-    if k in processors.__dict__:
-        for item in processors.__dict__[k]:
+def _frozen(name: str, values: dict):
+    """
+    Read-only object holding exactly the given settings.
+    Slotted, so attribute reads go straight to a slot instead of through an instance dict.
+    """
+    cls = make_dataclass(name, list(values), frozen=True, slots=True, eq=False)
+    return cls(**values)
+
+
+conf = _frozen("Conf", load_module("config.settings"))
+# Frequently read values, bound once so the hot path skips the namespace lookups
+API_KEY = conf.API_KEY
+ENQUEUE_TIMEOUT = conf.ENQUEUE_TIMEOUT
+MIN_SEGMENTABLE_LENGTH = conf.MIN_SEGMENTABLE_LENGTH
+
+
+def _load_processors() -> dict:
+    """Build the processors and the values derived from them, instantiating every separator and layer."""
+    processors = _frozen("Processors", load_module("config.processors"))
+
+    for k in ["INTENT_SEPARATORS", "CLASSIFICATION_LAYERS"]:
+        for item in getattr(processors, k, ()):
             item["instance"] = load_class(item["path"], item.get("factory", {}))
 
-__all__ = ["conf", "processors"]
+    # Normalized once here so the classification loop can read them as-is
+    for layer in getattr(processors, "CLASSIFICATION_LAYERS", ()):
+        layer["cost"] = int(layer.get("cost", layer.get("job_cost", 0)))
+        layer["confidence_threshold"] = float(
+            layer.get("confidence_threshold", processors.DEFAULT_INTENT_CONFIDENCE_THRESHOLD)
+        )
+        layer["speculative"] = bool(layer.get("speculative", False))
+
+    # Both priority orders built once, tuples can be shared by every task and segment
+    layers_asc = tuple(processors.CLASSIFICATION_LAYERS)
+    layers_desc = tuple(reversed(processors.CLASSIFICATION_LAYERS))
+
+    return {
+        "processors": processors,
+        "DEFAULT_INTENT_CONFIDENCE_THRESHOLD": processors.DEFAULT_INTENT_CONFIDENCE_THRESHOLD,
+        "INTENT_SEPARATORS": processors.INTENT_SEPARATORS,
+        "CLASSIFICATION_LAYERS": processors.CLASSIFICATION_LAYERS,
+        "LAYERS_ASC": layers_asc,
+        "LAYERS_DESC": layers_desc,
+        # Keyed by a task's priority_order
+        "LAYERS_BY_ORDER": MappingProxyType({"ascending": layers_asc, "descending": layers_desc}),
+    }
+
+
+_PROCESSOR_NAMES = frozenset({
+    "processors",
+    "DEFAULT_INTENT_CONFIDENCE_THRESHOLD",
+    "INTENT_SEPARATORS",
+    "CLASSIFICATION_LAYERS",
+    "LAYERS_ASC",
+    "LAYERS_DESC",
+    "LAYERS_BY_ORDER",
+})
+
+
+def __getattr__(name):
+    # Processors are loaded on first access, code that only needs conf never instantiates them.
+    # Stored as module globals afterwards, so this only runs once.
+    if name in _PROCESSOR_NAMES:
+        loaded = _load_processors()
+        globals().update(loaded)
+        return loaded[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# The _PROCESSOR_NAMES aren't listed, a star import would load the processors just to export them
+__all__ = [
+    "conf",
+    "API_KEY",
+    "ENQUEUE_TIMEOUT",
+    "MIN_SEGMENTABLE_LENGTH",
+]
@@ -1,4 +1,11 @@
 from .base import IntentLayer
-from .local_model import LocalModelIntentLayer
 
 __all__ = ["IntentLayer", "LocalModelIntentLayer"]
+
+
+def __getattr__(name):
+    # Resolved on first access so importing the package doesn't pull in torch
+    if name == "LocalModelIntentLayer":
+        from .local_model import LocalModelIntentLayer
+        return LocalModelIntentLayer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
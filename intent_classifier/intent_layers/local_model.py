@@ -1,11 +1,11 @@
+import asyncio
+import contextlib
 import logging
 import os
 import glob
+import zipfile
 from pathlib import Path
 
-import torch
-import torch.nn as nn
-
 from intent_classifier.conf import conf
 
 from .base import IntentLayer
@@ -18,6 +18,7 @@ logger = logging.getLogger(conf.APP_NAME)
 class LocalModelIntentLayer(IntentLayer):
     """
     Local PyTorch model-based intent classification layer.
+    torch is imported where it's used, so it's only loaded when this layer is enabled.
     """
     
     def __init__(self, weights_path="models/local_model.pt", device="cpu", 
@@ -30,27 +31,42 @@ class LocalModelIntentLayer(IntentLayer):
         self.model = None
         self.vocab = None  # Will be loaded with the model
         self.intent_labels = None  # Will be loaded with the model
+        self._pending = []  # (segment, is_partial, future) waiting for the next batch
         
-        logger.debug(f"Initialized LocalModelIntentLayer with weights_path: {weights_path}, device: {device}")
+        logger.debug("Initialized LocalModelIntentLayer with weights_path: %s, device: %s", weights_path, device)
     
     
     async def on_startup(self):
         """
         Initialize and load the PyTorch model during startup.
+        Loading blocks, so it runs in a thread to let other layers start meanwhile.
         """
+        await asyncio.to_thread(self._load_model)
+
+        # Looked up once here instead of on every tokenized word
+        self._vocab_get = self.vocab.get
+        self._unk = self.vocab['<UNK>']
+        self._pad = self.vocab['<PAD>']
+
+    def _load_model(self):
+        import torch
+
         logger.debug("Starting LocalModelIntentLayer initialization...")
         
         try:
      
             if model_path is None:
-                logger.warning(f"No model files found in {results_dir}. Creating default model...")
+                logger.warning("No model files found in %s. Creating default model...", results_dir)
                 # Create a default model for testing
                 self._create_default_model()
                 return
             
             # Load the model checkpoint
-            logger.debug(f"Loading model from: {model_path}")
-            checkpoint = torch.load(model_path, map_location=self.device)
+            logger.debug("Loading model from: %s", model_path)
+            # Memory mapped on CPU so worker processes share the weight pages through the page cache.
+            # Other devices copy the weights over anyway, and legacy (non-zipfile) checkpoints can't be mapped
+            mmap = torch.device(self.device).type == "cpu" and zipfile.is_zipfile(model_path)
+            checkpoint = torch.load(model_path, map_location=self.device, mmap=mmap)
             
             # Extract model parameters and metadata
             if isinstance(checkpoint, dict):
@@ -71,26 +87,31 @@ class LocalModelIntentLayer(IntentLayer):
             hidden_dim = model_config.get('hidden_dim', 256)
             num_classes = model_config.get('num_classes', len(self.intent_labels))
             
-            logger.debug(f"Creating model with vocab_size={vocab_size}, num_classes={num_classes}")
-            self.model = IntentClassificationModel(
-                vocab_size=vocab_size,
-                embedding_dim=embedding_dim,
-                hidden_dim=hidden_dim,
-                num_classes=num_classes
-            )
+            logger.debug("Creating model with vocab_size=%d, num_classes=%d", vocab_size, num_classes)
+            # Built without allocating its parameters when mapped, load_state_dict then assigns the
+            # mapped tensors as the parameters instead of copying them into private memory
+            with torch.device("meta") if mmap else contextlib.nullcontext():
+                self.model = IntentClassificationModel(
+                    vocab_size=vocab_size,
+                    embedding_dim=embedding_dim,
+                    hidden_dim=hidden_dim,
+                    num_classes=num_classes
+                )
             
             # Load the state dict
-            self.model.load_state_dict(model_state)
+            self.model.load_state_dict(model_state, assign=mmap)
             self.model.to(self.device)
             self.model.eval()
             
-            logger.info(f"Successfully loaded LocalModelIntentLayer model from {model_path}")
-            logger.debug(f"Model has {sum(p.numel() for p in self.model.parameters())} parameters")
-            logger.debug(f"Vocabulary size: {len(self.vocab)}")
-            logger.debug(f"Intent labels: {self.intent_labels}")
+            logger.info("Successfully loaded LocalModelIntentLayer model from %s", model_path)
+            if logger.isEnabledFor(logging.DEBUG):
+                # Counting parameters walks the whole model, only done when it's logged
+                logger.debug("Model has %d parameters", sum(p.numel() for p in self.model.parameters()))
+                logger.debug("Vocabulary size: %d", len(self.vocab))
+                logger.debug("Intent labels: %s", self.intent_labels)
             
         except Exception as e:
-            logger.error(f"Failed to load model: {e}")
+            logger.error("Failed to load model: %s", e)
             logger.debug("Creating default model as fallback...")
             self._create_default_model()
     
@@ -133,71 +154,106 @@ class LocalModelIntentLayer(IntentLayer):
         Simple tokenization for text input.
         In a real implementation, this would match your training preprocessing.
         """
+        import torch
+
         # Basic tokenization - split on spaces and convert to lowercase
-        tokens = text.lower().strip().split()
+        tokens = text.lower().split()
         
         # Convert to token IDs
-        token_ids = []
-        for token in tokens[:max_length-2]:  # Leave room for START/END tokens
-            token_ids.append(self.vocab.get(token, self.vocab['<UNK>']))
+        vocab_get = self._vocab_get
+        unk = self._unk
+        token_ids = [vocab_get(token, unk) for token in tokens[:max_length-2]]  # Leave room for START/END tokens
         
-        # Add padding if needed
-        while len(token_ids) < max_length:
-            token_ids.append(self.vocab['<PAD>'])
+        # Add padding if needed, one extend instead of an append per slot
+        token_ids += [self._pad] * (max_length - len(token_ids))
         
-        return torch.tensor(token_ids, dtype=torch.long).unsqueeze(0)  # Add batch dimension
+        return torch.tensor([token_ids], dtype=torch.long)  # Built with its batch dimension
     
     
     async def classify(self, previous_segments: list[str], segment: str, is_partial: bool = False) -> dict:
         """
         Classify the given text segment using the loaded PyTorch model.
+        Concurrent calls are collected and run through the model together, up to batch_size at a time.
         """
-        logger.debug(f"Starting classification for segment: '{segment[:50]}...' (partial: {is_partial})")
-        logger.debug(f"Previous segments count: {len(previous_segments)}")
+        loop = asyncio.get_running_loop()
+        done = loop.create_future()
+        self._pending.append((segment, is_partial, done))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush_pending()
+        elif len(self._pending) == 1:
+            # Whatever else gets queued before the loop comes back around joins this batch
+            loop.call_soon(self._flush_pending)
+
+        return await done
+
+    def _flush_pending(self):
+        """Run all pending classify calls through a single model call."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        results = self._predict([segment for segment, _, _ in batch], [is_partial for _, is_partial, _ in batch])
+        for (_, _, done), result in zip(batch, results):
+            if not done.done():
+                done.set_result(result)
+
+    def _predict(self, segments: list[str], partial_flags: list[bool]) -> list[dict]:
+        import torch
+
+        log_debug = logger.isEnabledFor(logging.DEBUG)
+        if log_debug:
+            logger.debug("Starting classification for %d segment(s)", len(segments))
         
         try:
-            logger.debug("Tokenizing input text...")
-            input_tensor = self._tokenize_text(segment)
+            # One row per segment, (batch, max_length)
+            tokenize = self._tokenize_text
+            input_tensor = torch.cat([tokenize(segment) for segment in segments])
             input_tensor = input_tensor.to(self.device)
-            logger.debug(f"Input tensor shape: {input_tensor.shape}")
+            if log_debug:
+                logger.debug("Input tensor shape: %s", input_tensor.shape)
             
             # Run inference
-            logger.debug("Running model inference...")
             with torch.no_grad():
                 logits, probabilities = self.model(input_tensor)
             
-            # Get predictions
-            predicted_class = torch.argmax(probabilities, dim=-1).item()
-            confidence = probabilities[0, predicted_class].item()
-            
-            intent_label = self.intent_labels[predicted_class]
-            
-            logger.debug(f"Model predictions - Intent: {intent_label}, Confidence: {confidence:.4f}")
-            logger.debug(f"Full probability distribution: {probabilities[0].tolist()}")
-            
-            # Create result dictionary
-            result = {
-                "intent": intent_label,
-                "confidence": float(confidence),
-                "raw_text": segment,
-                "is_partial": is_partial,
-                "model_info": {
-                    "predicted_class": int(predicted_class),
-                    "all_probabilities": {
-                        label: float(prob) for label, prob in zip(self.intent_labels, probabilities[0])
+            # Get predictions, moved to Python lists in one go instead of .item() per value
+            predicted_classes = torch.argmax(probabilities, dim=-1).tolist()
+            all_probabilities = probabilities.tolist()
+            intent_labels = self.intent_labels
+
+            results = []
+            for segment, is_partial, predicted_class, row in zip(
+                segments, partial_flags, predicted_classes, all_probabilities
+            ):
+                intent_label = intent_labels[predicted_class]
+                confidence = row[predicted_class]
+                if log_debug:
+                    logger.debug("Model predictions - Intent: %s, Confidence: %.4f", intent_label, confidence)
+                    logger.debug("Full probability distribution: %s", row)
+
+                results.append({
+                    "intent": intent_label,
+                    "confidence": confidence,
+                    "raw_text": segment,
+                    "is_partial": is_partial,
+                    "model_info": {
+                        "predicted_class": predicted_class,
+                        "all_probabilities": dict(zip(intent_labels, row)),
                     }
-                }
-            }
+                })
             
-            logger.debug(f"Classification completed successfully: {result['intent']} (confidence: {result['confidence']:.4f})")
-            return result
+            return results
             
         except Exception as e:
-            logger.error(f"Error during classification: {e}", exc_info=True)
-            return {
-                "intent": "unknown",
-                "confidence": 0.0,
-                "error": str(e),
-                "raw_text": segment,
-                "is_partial": is_partial
-            }
+            logger.error("Error during classification: %s", e, exc_info=True)
+            return [
+                {
+                    "intent": "unknown",
+                    "confidence": 0.0,
+                    "error": str(e),
+                    "raw_text": segment,
+                    "is_partial": is_partial
+                }
+                for segment, is_partial in zip(segments, partial_flags)
+            ]
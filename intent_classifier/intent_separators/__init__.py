@@ -1,7 +1,14 @@
 from .base import IntentSeparator
-from .local_model import LocalModelIntentSeparator
 
 __all__ = [
     "IntentSeparator",
     "LocalModelIntentSeparator",
 ]
+
+
+def __getattr__(name):
+    # Resolved on first access so importing the package doesn't load every separator
+    if name == "LocalModelIntentSeparator":
+        from .local_model import LocalModelIntentSeparator
+        return LocalModelIntentSeparator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
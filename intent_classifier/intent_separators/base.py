@@ -34,6 +34,23 @@ class IntentSeparator:
         return len(content) > 5
 
 
+    def fast_check(self, content: str) -> bool | None:
+        """
+        Synchronous shortcut for check_condition, used before it when the condition is a pure check on the text.
+        Return None to have check_condition awaited instead. By default, there's no shortcut.
+        """
+        return None
+
+
+    async def should_segment(self, content: str) -> bool:
+        """
+        Cheap check run before create_segments, return False when the content
+        obviously holds a single segment so the expensive path is skipped.
+        By default, always segments.
+        """
+        return True
+
+
     async def create_segments(self, content: str) -> List[str]:
         """
         Split the given content into segments that can be independently classified.
@@ -59,9 +76,10 @@ class IntentSeparator:
     
 
 
-    async def validate_segment(self, segment: str) -> bool:
+    def validate_segment(self, segment: str) -> bool:
         """
         Validate that the generated segments are reasonable.
+        Synchronous, validation is a pure check on the text and needs no event loop round trip.
         
         This can be used to ensure segments meet certain criteria
         (e.g., minimum length, not empty, etc.)
@@ -72,12 +90,25 @@ class IntentSeparator:
         Returns:
             True if the segment is valid, False otherwise
         """
-        # Default validation: ensure no empty segments and reasonable length
-        s = segment.strip()
-        return s and len(s) > 3
+        # Default validation: ensure no empty segments and reasonable length (more than 3 characters once stripped)
+        if len(segment) <= 3:
+            return False
+        # Usual case, nothing to strip so the length already counts
+        if not segment[0].isspace() and not segment[-1].isspace():
+            return True
+        return len(segment.strip()) > 3
+
+
+    def validate_segments(self, segments: List[str]) -> List[bool]:
+        """
+        Validate several segments in one pass.
+        Can be overridden by subclasses that can check them all at once.
+        """
+        return [self.validate_segment(segment) for segment in segments]
 
 
-    async def _build_segment(self, _type: str, text: str, metadata: dict = {}) -> str:
+    @staticmethod
+    def _build_segment(_type: str, text: str, metadata: dict | None = None) -> dict:
         """
         Segment types:
         - "text": Regular text segment
@@ -85,5 +116,5 @@ class IntentSeparator:
         return {
             "type": _type,
             "text": text,
-            "metadata": metadata
+            "metadata": metadata if metadata is not None else {}
         }
@@ -1,14 +1,33 @@
+import re
+
 from ..base import IntentSeparator
 
+# Sentence boundary: whitespace after ".", "!" or "?" that is followed by the start of a new sentence
+_SENT_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'])")
+
 class LocalModelIntentSeparator(IntentSeparator):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-    async def check_condition(self, content: str) -> bool:
+    def fast_check(self, content: str) -> bool:
         """
         Return if the content contains more than 7 words.
+        Counts the separating spaces instead of building the list of words.
+        """
+        # strip() returns the same string when there's nothing to strip
+        return content.strip().count(" ") > 6
+
+    async def check_condition(self, content: str) -> bool:
+        return self.fast_check(content)
+
+    async def should_segment(self, content: str) -> bool:
+        """
+        Return if the content has a sentence boundary and enough words to hold more than one sentence.
         """
-        return len(content.strip().split(" ")) > 7
+        return content.count(" ") > 6 and _SENT_RE.search(content) is not None
     
     async def create_segments(self, content: str) -> list[str]:
-        return [content]
+        """
+        Split the content into sentences with a precompiled regex, a fraction of the cost of a full parser.
+        """
+        return [s for s in (s.strip() for s in _SENT_RE.split(content)) if s]
@@ -1,7 +1,9 @@
 import asyncio
 import logging
+from collections.abc import Sequence
+from itertools import islice
 
-from .conf import conf, processors
+from .conf import conf
 
 logger = logging.getLogger(conf.APP_NAME)
 
@@ -9,53 +11,225 @@ logger = logging.getLogger(conf.APP_NAME)
 # --------------------------------------------------------------------------- #
 # Layer logic
 # --------------------------------------------------------------------------- #
+async def started_instance(item: dict):
+    """
+    Instance of a separator or layer, its on_startup runs on first use (unless started eagerly in lifespan).
+    Concurrent first users wait on the same startup and all get its error if it fails,
+    the next user after that tries to start it again.
+    A new event loop (a reload, another lifespan) starts it again too, the previous loop's startup
+    future can't be awaited from this one.
+    """
+    loop = asyncio.get_running_loop()
+    startup_loop, startup = item.get("startup", (None, None))
+    if startup_loop is not loop or (startup.done() and not _started(item)):
+        startup = asyncio.ensure_future(item["instance"].on_startup())
+        item["startup"] = (loop, startup)
+
+    if startup.done():
+        startup.result()
+    else:
+        # Shielded so a cancelled probe doesn't cancel the startup other segments are waiting on
+        await asyncio.shield(startup)
+    return item["instance"]
+
+
+def _started(item: dict) -> bool:
+    startup_loop, startup = item.get("startup", (None, None))
+    return (
+        startup_loop is asyncio.get_running_loop()
+        and startup.done()
+        and not startup.cancelled()
+        and startup.exception() is None
+    )
+
+
+async def _probe(layer: dict, previous_segments, segment: str, is_partial: bool) -> bool:
+    instance = await started_instance(layer)
+    return await instance.check_condition(previous_segments, segment, is_partial=is_partial)
+
+
+async def _speculate(
+    layer: dict, budget: "JobBudget", index: int, previous_segments, segment: str, is_partial: bool
+) -> dict | None:
+    """
+    Probe a speculative layer and, when it applies and can still be paid for, classify right away
+    instead of waiting for the higher priority layers. None when the layer doesn't run.
+    """
+    if not await _probe(layer, previous_segments, segment, is_partial):
+        return None
+
+    await budget.wait_turn(index)
+    cost = layer["cost"]
+    if not budget.can_afford(cost):
+        return None
+    budget.spend(cost)
+    return await layer["instance"].classify(previous_segments, segment, is_partial=is_partial)
+
+
+class JobBudget:
+    """
+    Running cost of a task, shared by all of its segments.
+    Segments are classified concurrently, so the cost has to live somewhere they can all see it.
+
+    Earlier segments have first claim on it: when the budget can't cover `worst_case` (every segment
+    running every layer), a segment only spends once the segments before it are done.
+    """
+    def __init__(self, limit: int, segments: int = 1, worst_case: int = 0):
+        self.limit = limit
+        self.spent = 0
+        # Nothing to wait for when no segment can take budget another one would have needed
+        self._done = (
+            [asyncio.get_running_loop().create_future() for _ in range(segments)]
+            if worst_case > limit
+            else None
+        )
+
+    async def wait_turn(self, index: int) -> None:
+        """Wait until the segments before `index` are done spending."""
+        if self._done is not None and index:
+            # Shielded so a cancelled probe doesn't cancel the future the next segments wait on
+            await asyncio.shield(self._done[index - 1])
+
+    def finish(self, index: int) -> None:
+        """Mark segment `index` as done spending, lets the next one go."""
+        if self._done is not None and not self._done[index].done():
+            self._done[index].set_result(None)
+
+    def can_afford(self, cost: int) -> bool:
+        return self.spent + cost <= self.limit
+
+    def spend(self, cost: int) -> None:
+        self.spent += cost
+
+
+class SegmentPrefix(Sequence):
+    """
+    Read-only view of the first `stop` segments of a task.
+    Every segment gets one without copying, slicing each prefix out would be O(n^2) for long inputs.
+    """
+    __slots__ = ("_segments", "_stop")
+
+    def __init__(self, segments: tuple[str, ...], stop: int):
+        self._segments = segments
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._segments[:self._stop][index])
+        if index < 0:
+            index += self._stop
+        if not 0 <= index < self._stop:
+            raise IndexError("segment index out of range")
+        return self._segments[index]
+
+    def __iter__(self):
+        return islice(self._segments, self._stop)
+
+    def __repr__(self) -> str:
+        return f"SegmentPrefix({list(self)!r})"
+
+
 async def classify_segment(
-    task,
-    previous_segments: list[str],
+    previous_segments: Sequence[str],
     segment: str,
     layers: list[dict],
-    running_cost: int = 0,
+    budget: JobBudget,
     is_partial: bool = False,
-) -> tuple[int, dict] | None:
+    index: int = 0,
+) -> dict | None:
     
-    for layer in layers:
-        layer_instance = layer["instance"]
-        if layer.get("cost", 0) + running_cost > task.job_budget or not await layer_instance.check_condition(
-            previous_segments, segment, is_partial=is_partial):
-            continue
-
-        result = await layer_instance.classify(
-            previous_segments, segment, is_partial=is_partial
-        )
-        running_cost += layer.get("cost", 0)
-        await layer_instance.on_complete(result)
+    affordable = [layer for layer in layers if budget.can_afford(layer["cost"])]
+    # Budget already spent by other segments, nothing left to probe or dispatch
+    if not affordable:
+        logger.debug("Job budget exhausted, skipping segment")
+        budget.finish(index)
+        return None
 
-        threshold = float(
-            layer.get("confidence_threshold", processors.DEFAULT_INTENT_CONFIDENCE_THRESHOLD)
+    def attempt(layer: dict) -> asyncio.Task:
+        return asyncio.create_task(
+            _speculate(layer, budget, index, previous_segments, segment, is_partial)
+            if layer["speculative"]
+            else _probe(layer, previous_segments, segment, is_partial)
         )
-        result_confidence = result.get("confidence", 0.5)
 
-        if result_confidence > threshold:
-            await layer_instance.on_success(result)
-            return running_cost, result
-        else:
-            await layer_instance.on_failure(result, "Result below confidence threshold")
-    return running_cost, None
+    # Layers already started are probed all at once (speculative ones classify straight away too),
+    # the others are only started when the loop gets to them, so a layer is never loaded for a
+    # segment a higher priority layer answers. Results are still consumed in priority order
+    tasks = [attempt(layer) if _started(layer) else None for layer in affordable]
+
+    try:
+        for i, layer in enumerate(affordable):
+            task = tasks[i]
+            if task is None:
+                task = tasks[i] = attempt(layer)
+            layer_instance = layer["instance"]
+
+            if layer["speculative"]:
+                result = await task
+                if result is None:
+                    continue
+            else:
+                cost = layer["cost"]
+                if not await task:
+                    continue
+
+                await budget.wait_turn(index)
+                # Other segments may have spent the budget while the probe was awaited
+                if not budget.can_afford(cost):
+                    continue
+                budget.spend(cost)
+
+                result = await layer_instance.classify(
+                    previous_segments, segment, is_partial=is_partial
+                )
+            await layer_instance.on_complete(result)
+
+            result_confidence = result.get("confidence", 0.5)
+
+            if result_confidence > layer["confidence_threshold"]:
+                await layer_instance.on_success(result)
+                return result
+            else:
+                await layer_instance.on_failure(result, "Result below confidence threshold")
+        return None
+
+    finally:
+        # Lower priority probes and speculative classifications are not needed once a layer has answered
+        for task in tasks:
+            if task is None:
+                continue
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled():
+                # Marks a failure nobody awaited as retrieved, its result is discarded either way
+                task.exception()
+        # Also when it failed or was cancelled, later segments would wait forever otherwise
+        budget.finish(index)
 
 
 
 async def segment_text(intent_separators: list, content: str) -> list[str]:
     for intent_separator in intent_separators:
-        separator_instance = intent_separator["instance"]
+        separator_instance = await started_instance(intent_separator)
         
         logger.debug("Checking intent separator: %s", intent_separator["alias"])
-        if await separator_instance.check_condition(content):
+        # Answered synchronously when the separator can tell from the text alone
+        matched = separator_instance.fast_check(content)
+        if matched is None:
+            matched = await separator_instance.check_condition(content)
+        if matched:
             logger.debug("Intent separator %s matched condition", intent_separator["alias"])
+            # Single sentence content, nothing for this separator to split
+            if not await separator_instance.should_segment(content):
+                continue
             segments = await separator_instance.create_segments(content)
             logger.debug("Segments created: %r", segments)
 
-            if (segments is not None and len(segments) > 0 and
-                all(await asyncio.gather(*[separator_instance.validate_segment(seg) for seg in segments]))):
+            # Stops at the first invalid segment
+            if segments and all(separator_instance.validate_segment(seg) for seg in segments):
                 logger.debug("Using segments from separator: %s", intent_separator["alias"])
                 return segments
         
@@ -1,15 +1,24 @@
+import asyncio
+import weakref
+from types import MappingProxyType
+
 from .memory import MemoryQueue
 from .redis import RedisQueue
 from .base import QueueBackend
 
-QUEUE_MAPPING = {
+QUEUE_MAPPING = MappingProxyType({
     "memory": MemoryQueue,
     "redis": RedisQueue,
-}
+})
+_VALID_QUEUE_TYPES = ", ".join(QUEUE_MAPPING)
+
+# Instances per event loop, their events, tasks and connections only work on the loop they were made on
+_instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
 
 def get_queue(queue_type: str, **kwargs) -> QueueBackend:
     """
     Get a queue instance based on the queue type.
+    The same type and arguments return the same instance within an event loop.
     
     Args:
         queue_type: Type of queue ("memory" or "redis")
@@ -19,8 +28,20 @@ def get_queue(queue_type: str, **kwargs) -> QueueBackend:
         QueueBackend instance
     """
     queue_class = QUEUE_MAPPING.get(queue_type)
-    if not queue_class:
-        raise ValueError(f"Unknown queue type: {queue_type}")
-    return queue_class(**kwargs)
+    if queue_class is None:
+        raise ValueError(f"Unknown queue type: {queue_type} (valid: {_VALID_QUEUE_TYPES})")
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Nothing to share it with outside an event loop
+        return queue_class(**kwargs)
+
+    instances = _instances.setdefault(loop, {})
+    key = (queue_type, tuple(sorted(kwargs.items())))
+    queue = instances.get(key)
+    if queue is None:
+        queue = instances[key] = queue_class(**kwargs)
+    return queue
 
 __all__ = ["QueueBackend", "MemoryQueue", "RedisQueue", "get_queue"]
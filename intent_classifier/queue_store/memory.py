@@ -1,54 +1,120 @@
 import asyncio
+import logging
+from collections import deque
 from typing import Any, Callable, Awaitable
 
+from ..conf import conf
 from .base import QueueBackend
 
+logger = logging.getLogger(conf.APP_NAME)
+
+# Worker micro-batching: up to BATCH_SIZE items collected within BATCH_WINDOW seconds
+BATCH_SIZE = 16
+BATCH_WINDOW = 0.005
+
+# Consumers started by worker(), each takes its own batches from the shared queue
+WORKER_CONCURRENCY = 4
+
 class MemoryQueue(QueueBackend):
-    def __init__(self) -> None:
-        self._q: asyncio.Queue[Any] = asyncio.Queue()
-        self._worker_task: asyncio.Task | None = None
+    def __init__(self, maxsize: int | None = None) -> None:
+        # Plain deque + events, cheaper per item than asyncio.Queue's future per waiter
+        self._dq: deque[Any] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        # Bounded so a burst of tasks applies backpressure instead of growing memory, 0 for unbounded.
+        # Defaults to the configured size (SABER_QUEUE_MAX_SIZE) when the caller doesn't pick one
+        self._maxsize = conf.QUEUE_SETTINGS["memory"]["maxsize"] if maxsize is None else maxsize
+        self._worker_tasks: list[asyncio.Task] = []
         self._shutdown = False
 
     async def enqueue(self, item): 
-        await self._q.put(item)
+        while self._maxsize and len(self._dq) >= self._maxsize:
+            self._not_full.clear()
+            await self._not_full.wait()
+        self._dq.append(item)
+        self._not_empty.set()
         
     async def dequeue(self): 
-        return await self._q.get()
+        while not self._dq:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        item = self._dq.popleft()
+        self._not_full.set()
+        return item
         
     def task_done(self): 
-        self._q.task_done()
+        # Items aren't tracked once dequeued, nothing joins on the queue
+        pass
+
+    async def dequeue_many(self, max_count: int = BATCH_SIZE) -> list[Any]:
+        """
+        Wait for one item, then take up to max_count items in one go,
+        including whatever arrives within the batch window.
+        """
+        loop = asyncio.get_running_loop()
+        batch = [await self.dequeue()]
+        deadline = loop.time() + BATCH_WINDOW
+
+        while len(batch) < max_count:
+            if self._dq:
+                batch.append(self._dq.popleft())
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            self._not_empty.clear()
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+
+        self._not_full.set()
+        return batch
     
-    async def worker(self, process_func: Callable[[Any], Awaitable[None]]) -> None:
-        """Start a background worker that processes items from the queue."""
+    async def worker(
+        self,
+        process_func: Callable[[Any], Awaitable[None]],
+        concurrency: int = WORKER_CONCURRENCY,
+    ) -> None:
+        """
+        Start background workers that process items from the queue.
+        A slow batch in one worker doesn't hold up the items the others pick up meanwhile.
+        """
+        # The queue is shared, it may be started again after a previous close()
+        self._shutdown = False
+
         async def _worker():
             while not self._shutdown:
                 try:
-                    # Get item from queue
-                    item = await self.dequeue()
+                    # Get a batch of items from queue
+                    batch = await self.dequeue_many()
                     
-                    # Process the item
-                    await process_func(item)
+                    # Process the batch concurrently, one failing item doesn't affect the others
+                    results = await asyncio.gather(
+                        *(process_func(item) for item in batch), return_exceptions=True
+                    )
                     
-                    # Mark task as done
-                    self.task_done()
+                    for result in results:
+                        if isinstance(result, Exception):
+                            # Log error but continue processing
+                            logger.error("Worker error processing item: %s", result, exc_info=result)
+                        # Mark task as done, failed or not, to prevent queue from hanging
+                        self.task_done()
                     
                 except asyncio.CancelledError:
                     break
-                except Exception as e:
+                except Exception:
                     # Log error but continue processing
-                    print(f"Worker error processing item: {e}")
-                    # Still mark task as done to prevent queue from hanging
-                    self.task_done()
+                    logger.exception("Worker error processing item")
         
-        # Start the worker task
-        self._worker_task = asyncio.create_task(_worker())
+        # Start the worker tasks
+        self._worker_tasks = [asyncio.create_task(_worker()) for _ in range(concurrency)]
     
     async def close(self) -> None:
-        """Close the queue and stop the worker."""
+        """Close the queue and stop the workers."""
         self._shutdown = True
-        if self._worker_task and not self._worker_task.done():
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
\ No newline at end of file
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
\ No newline at end of file
@@ -1,26 +1,140 @@
 import os
-import json
 import asyncio
+import logging
+import uuid
+from collections import deque
 from typing import Callable, Awaitable
 
-from redis.asyncio import Redis
+import orjson
+from redis.exceptions import ResponseError
+from ..redis_pool import get_redis
+from ..conf import conf
 from .base import QueueBackend
 
+logger = logging.getLogger(conf.APP_NAME)
+
 # move to conf + add methods to add/pop, that way we can use it in other places and skip http POST
 REDIS_LIST_NAME = "intent-tasks"
 
+# Max items popped per round trip
+BATCH_SIZE = 16
+
+# Enqueued items are sent in one LPUSH once PUSH_SIZE are pending or PUSH_INTERVAL seconds pass
+PUSH_SIZE = 256
+PUSH_INTERVAL = 0.001
+
+# Seconds close() lets the worker finish its batch before cancelling it
+SHUTDOWN_TIMEOUT = 5.0
+
+
+def _encode_default(obj):
+    """orjson fallback: pydantic models (queued tasks) as their JSON dict, anything else as a string."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
 class RedisQueue(QueueBackend):
     def __init__(self, url: str | None = None) -> None:
-        self._r = Redis.from_url(url or os.getenv("REDIS_URL"))
+        self._r = get_redis(url or os.getenv("REDIS_URL"))
         self._worker_task: asyncio.Task | None = None
         self._shutdown = False
+        self._buf: deque = deque()  # popped by dequeue_many but not handed out yet
+        self._has_blmpop = True  # BLMPOP needs Redis 7+, falls back to BRPOP + RPOP
+        self._pending: list[tuple[bytes, asyncio.Future]] = []
+        self._pushes: set[asyncio.Task] = set()
+        # Popped together with the task list, close() pushes to it to wake this instance's worker only
+        self._control_key = f"{REDIS_LIST_NAME}:shutdown:{uuid.uuid4().hex}".encode()
 
     async def enqueue(self, item):
-        await self._r.lpush(REDIS_LIST_NAME, json.dumps(item, default=str))
+        """Queue an item, returns once the LPUSH holding it has been executed."""
+        loop = asyncio.get_running_loop()
+        pushed = loop.create_future()
+        self._pending.append(
+            (orjson.dumps(item, default=_encode_default, option=orjson.OPT_NON_STR_KEYS), pushed)
+        )
+
+        if len(self._pending) >= PUSH_SIZE:
+            self._flush_pending()
+        elif len(self._pending) == 1:
+            loop.call_later(PUSH_INTERVAL, self._flush_pending)
+
+        await pushed
+
+    def _flush_pending(self) -> None:
+        """Hand all pending items to a single LPUSH."""
+        # Cancelling an enqueue (e.g. its timeout) cancels its future, those items are dropped
+        # so a caller that gave up on one doesn't have it run anyway
+        batch = [entry for entry in self._pending if not entry[1].cancelled()]
+        self._pending = []
+        if not batch:
+            return
+
+        push = asyncio.create_task(self._push_batch(batch))
+        self._pushes.add(push)
+        push.add_done_callback(self._pushes.discard)
+
+    async def _push_batch(self, batch: list[tuple[bytes, asyncio.Future]]) -> None:
+        try:
+            # LPUSH adds its values left to right, popping from the right keeps them in enqueue order
+            await self._r.lpush(REDIS_LIST_NAME, *(data for data, _ in batch))
+        except Exception as e:
+            for _, pushed in batch:
+                if not pushed.done():
+                    pushed.set_exception(e)
+        else:
+            for _, pushed in batch:
+                if not pushed.done():
+                    pushed.set_result(None)
 
     async def dequeue(self):
-        _, data = await self._r.brpop(REDIS_LIST_NAME)
-        return json.loads(data)
+        while not self._buf:
+            self._buf.extend(await self.dequeue_many())
+        return self._buf.popleft()
+
+    async def dequeue_many(self, max_count: int = BATCH_SIZE) -> list:
+        """
+        Block until at least one item is available, then return up to max_count items.
+        Returns an empty list when woken up by close() instead.
+        """
+        if self._buf:
+            return [self._buf.popleft() for _ in range(min(max_count, len(self._buf)))]
+
+        items = None
+        if self._has_blmpop:
+            try:
+                # Items are pushed on the left, so pop from the right to keep FIFO order
+                key, items = await self._r.blmpop(
+                    0, 2, REDIS_LIST_NAME, self._control_key, direction="RIGHT", count=max_count
+                )
+            except ResponseError:
+                self._has_blmpop = False
+            else:
+                if key == self._control_key:
+                    return []
+
+        if items is None:
+            key, first = await self._r.brpop([REDIS_LIST_NAME, self._control_key])
+            if key == self._control_key:
+                return []
+            items = [first]
+            if max_count > 1:
+                items.extend(await self._pop_right(max_count - 1))
+
+        return [orjson.loads(data) for data in items]
+
+    async def _pop_right(self, count: int) -> list:
+        """
+        Atomically pop up to count items from the right (oldest) end, without blocking.
+        LRANGE + LTRIM in a transaction, works on Redis versions without RPOP's count argument.
+        """
+        async with self._r.pipeline(transaction=True) as pipe:
+            pipe.lrange(REDIS_LIST_NAME, -count, -1)
+            pipe.ltrim(REDIS_LIST_NAME, 0, -count - 1)
+            items, _ = await pipe.execute()
+        # LRANGE reads left to right, the oldest item is the rightmost
+        items.reverse()
+        return items
 
     def task_done(self):
         # Redis doesn't need a task_done since it doesn't track in-flight tasks
@@ -28,22 +142,34 @@ class RedisQueue(QueueBackend):
     
     async def worker(self, process_func: Callable[[any], Awaitable[None]]) -> None:
         """Start a background worker that processes items from the Redis queue."""
+        # The queue is shared, it may be started again after a previous close()
+        self._shutdown = False
+
         async def _worker():
             while not self._shutdown:
                 try:
-                    # Get item from queue (blocks until item available)
-                    item = await self.dequeue()
+                    # Get a batch of items from queue (blocks until at least one is available)
+                    batch = await self.dequeue_many()
+                    if not batch:
+                        # Woken up by close()
+                        continue
                     
-                    # Process the item
-                    await process_func(item)
+                    # Process the batch concurrently, one failing item doesn't affect the others
+                    results = await asyncio.gather(
+                        *(process_func(item) for item in batch), return_exceptions=True
+                    )
                     
                     # Redis doesn't need explicit task_done
+                    for result in results:
+                        if isinstance(result, Exception):
+                            # Log error but continue processing
+                            logger.error("Worker error processing item: %s", result, exc_info=result)
                     
                 except asyncio.CancelledError:
                     break
-                except Exception as e:
+                except Exception:
                     # Log error but continue processing
-                    print(f"Worker error processing item: {e}")
+                    logger.exception("Worker error processing item")
         
         # Start the worker task
         self._worker_task = asyncio.create_task(_worker())
@@ -52,11 +178,24 @@ class RedisQueue(QueueBackend):
         """Close the Redis connection and stop the worker."""
         self._shutdown = True
         if self._worker_task and not self._worker_task.done():
-            self._worker_task.cancel()
+            # Wake a worker blocked on the list so it exits on its own, cancelling a blocking
+            # pop would tear down its connection. It finishes the batch it's working on first.
+            await self._r.lpush(self._control_key, b"")
             try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
+                await asyncio.wait_for(asyncio.shield(self._worker_task), timeout=SHUTDOWN_TIMEOUT)
+            except asyncio.TimeoutError:
+                self._worker_task.cancel()
+                try:
+                    await self._worker_task
+                except asyncio.CancelledError:
+                    pass
+            # Not consumed if the worker was between pops
+            await self._r.delete(self._control_key)
         
+        # Send what's still buffered before the connection goes away
+        self._flush_pending()
+        if self._pushes:
+            await asyncio.gather(*self._pushes, return_exceptions=True)
+
         # Close Redis connection
-        await self._r.aclose()
\ No newline at end of file
+        await self._r.aclose()
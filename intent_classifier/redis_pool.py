@@ -0,0 +1,33 @@
+import asyncio
+import weakref
+
+from redis.asyncio import BlockingConnectionPool, Redis
+
+MAX_CONNECTIONS = 64
+# Seconds a command waits for a free connection once all of them are in use
+POOL_TIMEOUT = 5
+
+# Per event loop, pooled connections can't be used from another loop than the one they were opened on
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, BlockingConnectionPool]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis(url: str) -> Redis:
+    """
+    Redis client backed by a connection pool shared with every other client for the same url
+    on the running event loop, so the task queue and result store don't each open their own connections.
+    """
+    try:
+        pools = _pools.setdefault(asyncio.get_running_loop(), {})
+    except RuntimeError:
+        # Outside an event loop, the client gets a pool of its own
+        pools = {}
+    pool = pools.get(url)
+    if pool is None:
+        # Blocking, so a burst beyond MAX_CONNECTIONS waits for a connection instead of failing.
+        # Replies stay raw bytes, payloads go straight to orjson without a UTF-8 decode first
+        pool = pools[url] = BlockingConnectionPool.from_url(
+            url, max_connections=MAX_CONNECTIONS, timeout=POOL_TIMEOUT, decode_responses=False
+        )
+    return Redis(connection_pool=pool)
@@ -1,17 +1,37 @@
+import asyncio
+import weakref
+from types import MappingProxyType
+
 from .memory import MemoryResultStore
 from .redis import RedisResultStore
 from .base import ResultBackend
 
-RESULT_STORE_MAPPING = {
+RESULT_STORE_MAPPING = MappingProxyType({
     "memory": MemoryResultStore,
     "redis": RedisResultStore,
-}
+})
+_VALID_STORE_TYPES = ", ".join(RESULT_STORE_MAPPING)
+
+# Instances per event loop, their tasks and connections only work on the loop they were made on
+_instances: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict]" = weakref.WeakKeyDictionary()
 
 def get_result_store(store_type: str, **kwargs) -> ResultBackend:
     store_class = RESULT_STORE_MAPPING.get(store_type)
-    if not store_class:
-        raise ValueError(f"Unknown result store type: {store_type}")
-    
-    return store_class(**kwargs)
+    if store_class is None:
+        raise ValueError(f"Unknown result store type: {store_type} (valid: {_VALID_STORE_TYPES})")
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Nothing to share it with outside an event loop
+        return store_class(**kwargs)
+
+    # The same type and arguments return the same instance within an event loop
+    instances = _instances.setdefault(loop, {})
+    key = (store_type, tuple(sorted(kwargs.items())))
+    store = instances.get(key)
+    if store is None:
+        store = instances[key] = store_class(**kwargs)
+    return store
 
 __all__ = ["ResultBackend", "MemoryResultStore", "RedisResultStore", "get_result_store"]
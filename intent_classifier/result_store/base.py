@@ -1,8 +1,11 @@
-from typing import Any, Protocol, Optional
+from typing import Protocol, Optional
 import uuid
 
 class ResultBackend(Protocol):
-    async def store_result(self, task_id: uuid.UUID, result: Any, ttl: Optional[int] = None) -> None: ...
-    async def get_result(self, task_id: uuid.UUID) -> Any: ...
+    # Results are JSON encoded bytes, stored and returned as is
+    async def store_result(self, task_id: uuid.UUID, result: bytes, ttl: Optional[int] = None) -> None: ...
+    async def store_many(self, items: list[tuple[uuid.UUID, bytes, Optional[int]]]) -> None: ...
+    async def get_result(self, task_id: uuid.UUID) -> bytes | None: ...
     async def delete_result(self, task_id: uuid.UUID) -> bool: ...
+    async def delete_many(self, task_ids: list[uuid.UUID]) -> int: ...
     async def result_exists(self, task_id: uuid.UUID) -> bool: ...
@@ -1,10 +1,23 @@
 import asyncio
-import time
+import heapq
 import uuid
-from typing import Any, Dict, Optional, Tuple
+import weakref
+from typing import Dict, List, Optional, Tuple
 
 from .base import ResultBackend
 
+
+def _now() -> float:
+    """
+    The event loop's own monotonic clock, the same one its sleeps are scheduled on.
+    Monotonic so clock adjustments (NTP, manual changes) can't expire results early or keep them alive.
+    """
+    return asyncio.get_running_loop().time()
+
+
+def _cancel_task(task: asyncio.Task) -> None:
+    task.cancel()
+
 class MemoryResultStore(ResultBackend):
     def __init__(self, default_ttl: int = 3600) -> None:
         """
@@ -13,50 +26,80 @@ class MemoryResultStore(ResultBackend):
         Args:
             default_ttl: Default time-to-live in seconds (1 hour by default)
         """
-        self._results: Dict[uuid.UUID, Tuple[Any, float]] = {}  # task_id -> (result, expiry_time)
+        self._results: Dict[uuid.UUID, Tuple[bytes, float]] = {}  # task_id -> (result, expiry_time)
+        # Min-heap of (expiry_time, task_id), may hold stale entries for overwritten/deleted results
+        self._expiry_heap: List[Tuple[float, uuid.UUID]] = []
         self._default_ttl = default_ttl
         self._cleanup_task: Optional[asyncio.Task] = None
         self._start_cleanup_task()
     
     def _start_cleanup_task(self) -> None:
-        """Start the background cleanup task."""
+        """Start the background cleanup task, deferred to the first store if no event loop is running yet."""
         if self._cleanup_task is None or self._cleanup_task.done():
-            self._cleanup_task = asyncio.create_task(self._cleanup_expired())
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+
+            # The task only holds a weak reference, so the store can still be garbage collected
+            self._cleanup_task = loop.create_task(self._cleanup_expired(weakref.ref(self)))
+            weakref.finalize(self, _cancel_task, self._cleanup_task)
     
-    async def _cleanup_expired(self) -> None:
+    @staticmethod
+    async def _cleanup_expired(store_ref: "weakref.ref[MemoryResultStore]") -> None:
         """Background task to clean up expired results."""
+        loop = asyncio.get_running_loop()
         while True:
-            try:
-                current_time = time.time()
-                expired_keys = [
-                    task_id for task_id, (_, expiry_time) in self._results.items()
-                    if current_time > expiry_time
-                ]
-                
-                for task_id in expired_keys:
-                    del self._results[task_id]
-                
-                # Run cleanup every 60 seconds
-                await asyncio.sleep(60)
-            except asyncio.CancelledError:
+            store = store_ref()
+            if store is None:
                 break
+
+            try:
+                next_run = store._remove_expired(loop.time())
             except Exception:
                 # Continue cleanup even if there's an error
-                await asyncio.sleep(60)
+                next_run = 60
+            del store
+
+            await asyncio.sleep(next_run)
+
+    def _remove_expired(self, current_time: float) -> float:
+        """Remove expired results, returns the seconds until cleanup should run again."""
+        heap = self._expiry_heap
+
+        # Only touch what actually expired instead of scanning every result
+        while heap and heap[0][0] < current_time:
+            _, task_id = heapq.heappop(heap)
+            entry = self._results.get(task_id)
+            # Stale heap entry if the result was overwritten with a later expiry or removed
+            if entry is not None and entry[1] < current_time:
+                del self._results[task_id]
+        
+        # Run cleanup when the next result expires, at least once a second and at most every 60
+        next_run = heap[0][0] - current_time if heap else 60
+        return min(60, max(1, next_run))
     
-    async def store_result(self, task_id: uuid.UUID, result: Any, ttl: Optional[int] = None) -> None:
-        """Store a result with optional TTL."""
+    async def store_result(self, task_id: uuid.UUID, result: bytes, ttl: Optional[int] = None) -> None:
+        """Store an encoded result with optional TTL."""
         ttl = ttl or self._default_ttl
-        expiry_time = time.time() + ttl
+        expiry_time = _now() + ttl
         self._results[task_id] = (result, expiry_time)
+        heapq.heappush(self._expiry_heap, (expiry_time, task_id))
+        self._start_cleanup_task()
     
-    async def get_result(self, task_id: uuid.UUID) -> Any:
-        """Get a result by task ID, returns None if not found or expired."""
-        if task_id not in self._results:
+    async def store_many(self, items: list[tuple[uuid.UUID, bytes, Optional[int]]]) -> None:
+        """Store several encoded results, (task_id, result, ttl) each."""
+        for task_id, result, ttl in items:
+            await self.store_result(task_id, result, ttl)
+    
+    async def get_result(self, task_id: uuid.UUID) -> bytes | None:
+        """Get an encoded result by task ID, returns None if not found or expired."""
+        entry = self._results.get(task_id)
+        if entry is None:
             return None
         
-        result, expiry_time = self._results[task_id]
-        if time.time() > expiry_time:
+        result, expiry_time = entry
+        if _now() > expiry_time:
             # Result has expired, remove it
             del self._results[task_id]
             return None
@@ -65,25 +108,23 @@ class MemoryResultStore(ResultBackend):
     
     async def delete_result(self, task_id: uuid.UUID) -> bool:
         """Delete a result by task ID. Returns True if deleted, False if not found."""
-        if task_id in self._results:
-            del self._results[task_id]
-            return True
-        return False
+        return self._results.pop(task_id, None) is not None
+
+    async def delete_many(self, task_ids: list[uuid.UUID]) -> int:
+        """Delete several results, returns how many existed."""
+        pop = self._results.pop
+        return sum(pop(task_id, None) is not None for task_id in task_ids)
     
     async def result_exists(self, task_id: uuid.UUID) -> bool:
         """Check if a result exists and is not expired."""
-        if task_id not in self._results:
+        entry = self._results.get(task_id)
+        if entry is None:
             return False
         
-        _, expiry_time = self._results[task_id]
-        if time.time() > expiry_time:
+        _, expiry_time = entry
+        if _now() > expiry_time:
             # Result has expired, remove it
             del self._results[task_id]
             return False
         
         return True
-    
-    def __del__(self):
-        """Clean up the background task when the instance is destroyed."""
-        if self._cleanup_task and not self._cleanup_task.done():
-            self._cleanup_task.cancel()
@@ -1,10 +1,16 @@
-import json
+import asyncio
 import uuid
-from typing import Any, Optional
+from typing import Optional
 
-from redis.asyncio import Redis
+from ..redis_pool import get_redis
 from .base import ResultBackend
 
+# Writes are buffered and sent in one pipeline once FLUSH_SIZE are pending or FLUSH_INTERVAL seconds pass
+FLUSH_SIZE = 32
+FLUSH_INTERVAL = 0.002
+# Keys per DEL command in delete_many, keeps single commands reasonably sized
+DELETE_CHUNK_SIZE = 1000
+
 class RedisResultStore(ResultBackend):
     def __init__(self, url: str | None = None, default_ttl: int = 3600) -> None:
         """
@@ -14,41 +20,91 @@ class RedisResultStore(ResultBackend):
             url: Redis connection URL
             default_ttl: Default time-to-live in seconds (1 hour by default)
         """
-        self._r = Redis.from_url(url or "redis://localhost:6379/0")
+        self._r = get_redis(url or "redis://localhost:6379/0")
         self._default_ttl = default_ttl
-        self._key_prefix = "intent-result:"
+        self._key_prefix = b"intent-result:"
+        self._pending: list[tuple[bytes, bytes, int, asyncio.Future]] = []
+        self._writes: set[asyncio.Task] = set()
     
-    def _get_key(self, task_id: uuid.UUID) -> str:
-        """Generate Redis key for a task ID."""
-        return f"{self._key_prefix}{task_id}"
+    def _get_key(self, task_id: uuid.UUID) -> bytes:
+        """Generate Redis key for a task ID, from the bare hex form (cheaper than str() of the UUID)."""
+        return self._key_prefix + task_id.hex.encode()
     
-    async def store_result(self, task_id: uuid.UUID, result: Any, ttl: Optional[int] = None) -> None:
-        """Store a result with optional TTL. Redis handles expiration automatically."""
+    async def store_result(self, task_id: uuid.UUID, result: bytes, ttl: Optional[int] = None) -> None:
+        """Store an encoded result with optional TTL. Redis handles expiration automatically."""
         key = self._get_key(task_id)
         ttl = ttl or self._default_ttl
         
-        # Serialize the result to JSON
-        serialized_result = json.dumps(result, default=str)
-        
-        # Store with TTL (Redis handles expiration)
-        await self._r.setex(key, ttl, serialized_result)
+        # Queue the write, returns once the pipeline holding it has been executed
+        loop = asyncio.get_running_loop()
+        written = loop.create_future()
+        self._pending.append((key, result, ttl, written))
+
+        if len(self._pending) >= FLUSH_SIZE:
+            self._flush_pending()
+        elif len(self._pending) == 1:
+            loop.call_later(FLUSH_INTERVAL, self._flush_pending)
+
+        await written
+
+    def _flush_pending(self) -> None:
+        """Hand all pending writes to a single pipeline."""
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        write = asyncio.create_task(self._write_batch(batch))
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+
+    async def store_many(self, items: list[tuple[uuid.UUID, bytes, Optional[int]]]) -> None:
+        """Store several encoded results, (task_id, result, ttl) each, in one round trip."""
+        await self._set_many(
+            [(self._get_key(task_id), result, ttl or self._default_ttl) for task_id, result, ttl in items]
+        )
+
+    async def _set_many(self, entries: list[tuple[bytes, bytes, int]]) -> None:
+        # Store with TTL (Redis handles expiration), one round trip for all entries
+        async with self._r.pipeline(transaction=False) as pipe:
+            for key, serialized_result, ttl in entries:
+                pipe.set(key, serialized_result, ex=ttl)
+            await pipe.execute()
+
+    async def _write_batch(self, batch: list[tuple[bytes, bytes, int, asyncio.Future]]) -> None:
+        try:
+            await self._set_many([(key, result, ttl) for key, result, ttl, _ in batch])
+        except Exception as e:
+            for *_, written in batch:
+                if not written.done():
+                    written.set_exception(e)
+        else:
+            for *_, written in batch:
+                if not written.done():
+                    written.set_result(None)
     
-    async def get_result(self, task_id: uuid.UUID) -> Any:
-        """Get a result by task ID, returns None if not found or expired."""
+    async def get_result(self, task_id: uuid.UUID) -> bytes | None:
+        """Get an encoded result by task ID, returns None if not found or expired."""
         key = self._get_key(task_id)
-        data = await self._r.get(key)
-        
-        if data is None:
-            return None
-        
-        # Deserialize the result from JSON
-        return json.loads(data)
+        return await self._r.get(key)
     
     async def delete_result(self, task_id: uuid.UUID) -> bool:
         """Delete a result by task ID. Returns True if deleted, False if not found."""
         key = self._get_key(task_id)
         deleted_count = await self._r.delete(key)
         return deleted_count > 0
+
+    async def delete_many(self, task_ids: list[uuid.UUID]) -> int:
+        """Delete several results, returns how many existed. One variadic DEL per DELETE_CHUNK_SIZE keys."""
+        keys = [self._get_key(task_id) for task_id in task_ids]
+        if not keys:
+            return 0
+        if len(keys) <= DELETE_CHUNK_SIZE:
+            return await self._r.delete(*keys)
+
+        async with self._r.pipeline(transaction=False) as pipe:
+            for i in range(0, len(keys), DELETE_CHUNK_SIZE):
+                pipe.delete(*keys[i:i + DELETE_CHUNK_SIZE])
+            return sum(await pipe.execute())
     
     async def result_exists(self, task_id: uuid.UUID) -> bool:
         """Check if a result exists and is not expired."""
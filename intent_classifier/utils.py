@@ -1,29 +1,77 @@
+import functools
 import importlib
+import os
+from pathlib import Path
+
 import httpx
 
-async def send_post_request(url: str, payload: dict, api_key: str = None, timeout: httpx.Timeout = httpx.Timeout(10.0, connect=5.0)) -> None:
-    """Send a POST request to the caller's callback URL."""
-    headers = {
-        "Content-Type": "application/json",
-    }
+CALLBACK_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+CALLBACK_LIMITS = httpx.Limits(max_connections=200, max_keepalive_connections=100)
+CALLBACK_HEADERS = {
+    "Content-Type": "application/json",
+}
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the long-lived client shared by all callback requests.
+    HTTP/2 lets callbacks to the same host share one connection, HTTP/1.1 hosts are unaffected.
+    """
+    return httpx.AsyncClient(timeout=CALLBACK_TIMEOUT, limits=CALLBACK_LIMITS, http2=True)
+
+
+async def send_post_request(client: httpx.AsyncClient, url: str, payload: bytes, api_key: str = None) -> None:
+    """Send an already JSON encoded payload to the caller's callback URL."""
+    headers = CALLBACK_HEADERS
     if api_key:
-        headers["X-Api-Key"] = api_key
+        headers = {**headers, "X-Api-Key": api_key}
+
+    resp = await client.post(url, content=payload, headers=headers)
+    
+    resp.raise_for_status()
+@functools.lru_cache(maxsize=None)
+def _import(path: str):
+    # Skips import_module's locking and name resolution on repeated loads
+    return importlib.import_module(path)
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve_class(path: str):
+    mod_path, _, attr = path.rpartition(".")
+    return getattr(_import(mod_path), attr)
+
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.post(url, json=payload, headers=headers)
-        
-        resp.raise_for_status()
 def load_module(path: str):
-    module = importlib.import_module(path)
+    module = _import(path)
+    namespace = vars(module)
+
+    # A module declaring __all__ picks its own settings, everything else is filtered by name
+    names = namespace.get("__all__")
+    if names is not None:
+        return {k: namespace[k] for k in names}
 
     return {
-        k: getattr(module, k)
-        for k in dir(module)
-        if k.isupper() and not k.startswith("_")
+        k: v
+        for k, v in namespace.items()
+        # First character checked first, rules out most imports and helpers early
+        if k[:1].isupper() and k.isupper()
     }
 
 def load_class(path: str, factory: dict):
-    mod_path, _, attr = path.rpartition(".")
-    module = importlib.import_module(mod_path)
-    clazz = getattr(module, attr)
-    return clazz(**factory)
\ No newline at end of file
+    # Only the class is cached, every call still builds a new instance
+    clazz = _resolve_class(path)
+    return clazz(**factory)
+
+
+def get_environment() -> str:
+    return (
+        os.getenv("SABER_ENVIRONMENT")
+        or os.getenv("ENVIRONMENT")
+        or os.getenv("ENV")
+        or "development"
+    ).lower()
+
+
+def env_files(base_dir: Path, environment: str) -> tuple[Path, ...]:
+    """The .env files of an environment, a value in an earlier file wins over the same one in a later file."""
+    return (base_dir / "envs" / f"{environment}.env", base_dir / ".env")
@@ -1,4 +1,34 @@
+import os
+from pathlib import Path
+
 import uvicorn
+from dotenv import dotenv_values
+
+from intent_classifier.utils import env_files, get_environment
+
+BASE_DIR = Path(__file__).resolve().parent
+
+
+def launcher_settings() -> dict[str, str]:
+    """
+    The environment the server will see, with the .env files read but not loaded.
+    Loading them here would put their values in this reloader process's environment, every reloaded
+    server would inherit those instead of reading the files again, so edits wouldn't apply on reload.
+    """
+    values = {}
+    for env_file in env_files(BASE_DIR, get_environment()):
+        for key, value in dotenv_values(env_file).items():
+            values.setdefault(key, value)
+    # Same precedence as load_dotenv(override=False), the process environment wins
+    return {**values, **os.environ}
+
 
 if __name__ == "__main__":
-    uvicorn.run("intent_classifier.api:app", host="127.0.0.1", port=8000, reload=True)
\ No newline at end of file
+    settings = launcher_settings()
+    uvicorn.run(
+        "intent_classifier.api:app",
+        # Local only by default, this is the hot-reloading dev server
+        host=settings.get("SABER_API_HOST") or "127.0.0.1",
+        port=int(settings.get("SABER_API_PORT") or 8005),
+        reload=True,
+    )
@@ -0,0 +1,14 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_importing_the_app_does_not_import_torch():
+    # In a fresh interpreter, modules this test process already imported would hide a regression
+    subprocess.run(
+        [sys.executable, "-c", "import intent_classifier.api, sys; assert 'torch' not in sys.modules"],
+        cwd=ROOT,
+        check=True,
+    )
@@ -0,0 +1,121 @@
+import asyncio
+import dataclasses
+import os
+import time
+import uuid
+
+import pytest
+
+# Read when the settings are loaded, so it has to be set before the app is imported
+os.environ.setdefault("SABER_API_KEY", "test-key")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from intent_classifier import api  # noqa: E402
+from intent_classifier import conf as conf_module  # noqa: E402
+from intent_classifier.queue_store.memory import BATCH_SIZE, WORKER_CONCURRENCY  # noqa: E402
+
+HEADERS = {"X-API-Key": os.environ["SABER_API_KEY"]}
+
+
+class EchoLayer:
+    """Answers every segment with itself, keeps the test independent of real models."""
+    async def on_startup(self):
+        pass
+
+    async def check_condition(self, previous_segments, segment, is_partial=False):
+        return True
+
+    async def classify(self, previous_segments, segment, is_partial=False):
+        return {"intent": segment, "confidence": 1.0}
+
+    async def on_complete(self, result):
+        pass
+
+    async def on_success(self, result):
+        pass
+
+    async def on_failure(self, result, reason):
+        pass
+
+
+@pytest.fixture
+def echo_layers(monkeypatch):
+    for layer in conf_module.CLASSIFICATION_LAYERS:
+        monkeypatch.setitem(layer, "instance", EchoLayer())
+
+
+def wait_for_result(client: TestClient, task_id: str, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(f"/result/{task_id}", headers=HEADERS)
+        if response.status_code == 200 or time.monotonic() > deadline:
+            break
+        time.sleep(0.02)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_tasks_processed_across_lifespans(echo_layers):
+    # Every TestClient runs the lifespan on a new event loop, like a server restart in the same process
+    for _ in range(2):
+        with TestClient(api.app) as client:
+            task_id = str(uuid.uuid4())
+            response = client.post(
+                "/queue/",
+                headers=HEADERS,
+                json={"task_id": task_id, "job": "classify", "content": "turn on the lights"},
+            )
+            assert response.status_code == 202
+
+            result = wait_for_result(client, task_id)
+            assert result["status"] == "completed"
+            assert result["results"] == [
+                {"segment": "turn on the lights", "eval": {"intent": "turn on the lights", "confidence": 1.0}}
+            ]
+
+
+def test_full_queue_rejects_enqueue(monkeypatch):
+    async def stalled(task):
+        # Never finishes, the queue only drains when the lifespan's close() cancels the workers
+        await asyncio.Event().wait()
+
+    monkeypatch.setattr(api, "process_task", stalled)
+    monkeypatch.setitem(conf_module.conf.QUEUE_SETTINGS["memory"], "maxsize", 1)
+    monkeypatch.setattr(api, "ENQUEUE_TIMEOUT", 0.05)
+
+    # Every worker stalls on the batch it took, at most BATCH_SIZE items each, then one item fills the queue
+    most_accepted = WORKER_CONCURRENCY * BATCH_SIZE + 1
+    statuses = []
+    with TestClient(api.app) as client:
+        while len(statuses) <= most_accepted:
+            response = client.post(
+                "/queue/",
+                headers=HEADERS,
+                json={"task_id": str(uuid.uuid4()), "job": "classify", "content": "hello"},
+            )
+            statuses.append(response.status_code)
+            if response.status_code != 202:
+                break
+
+    assert statuses[-1] == 503
+    assert response.json() == {"detail": "Task queue is full, try again later"}
+
+
+def test_failed_startup_is_undone(monkeypatch):
+    class FailingLayer(EchoLayer):
+        async def on_startup(self):
+            raise RuntimeError("model missing")
+
+    monkeypatch.setattr(api, "conf", dataclasses.replace(api.conf, EAGER_LAYERS=True))
+    for layer in conf_module.CLASSIFICATION_LAYERS:
+        monkeypatch.setitem(layer, "instance", FailingLayer())
+    logger_state = (api.logger.handlers, api.logger.propagate)
+
+    with pytest.raises(ExceptionGroup):
+        with TestClient(api.app):
+            pass
+
+    assert (api.logger.handlers, api.logger.propagate) == logger_state
+    assert api.http_client.is_closed
+    assert api.task_queue._shutdown
@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+
+from intent_classifier.logic import JobBudget, SegmentPrefix, classify_segment, started_instance
+
+
+class StubLayer:
+    """Layer whose probe delay, classify delay and failures are set per segment."""
+    def __init__(self, name, probe_delay=None, classify_delay=0, fail_on=(), confidence=1.0):
+        self.name = name
+        self.probe_delay = probe_delay or {}
+        self.classify_delay = classify_delay
+        self.fail_on = fail_on
+        self.confidence = confidence
+        self.classified = []
+        self.cancelled = False
+
+    async def on_startup(self):
+        pass
+
+    async def check_condition(self, previous_segments, segment, is_partial=False):
+        await asyncio.sleep(self.probe_delay.get(segment, 0))
+        if segment in self.fail_on:
+            raise RuntimeError(f"{self.name} failed on {segment}")
+        return True
+
+    async def classify(self, previous_segments, segment, is_partial=False):
+        self.classified.append(segment)
+        try:
+            await asyncio.sleep(self.classify_delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"intent": f"{self.name}:{segment}", "confidence": self.confidence}
+
+    async def on_complete(self, result):
+        pass
+
+    async def on_success(self, result):
+        pass
+
+    async def on_failure(self, result, reason):
+        pass
+
+
+def layer(instance, cost=1, speculative=False):
+    return {
+        "alias": instance.name,
+        "instance": instance,
+        "cost": cost,
+        "confidence_threshold": 0.5,
+        "speculative": speculative,
+    }
+
+
+def classify_all(segments, layers, budget):
+    return [
+        classify_segment(segments[:i], segment, layers, budget, index=i)
+        for i, segment in enumerate(segments)
+    ]
+
+
+@pytest.mark.parametrize("speculative", [False, True])
+def test_earliest_segment_spends_first(speculative):
+    async def run():
+        # The first segment's probe finishes last, it still gets the only affordable classification
+        stub = StubLayer("l", probe_delay={"first": 0.05})
+        layers = [layer(stub, speculative=speculative)]
+        segments = ["first", "second"]
+        budget = JobBudget(1, segments=2, worst_case=2)
+        return await asyncio.gather(*classify_all(segments, layers, budget))
+
+    assert asyncio.run(run()) == [{"intent": "l:first", "confidence": 1.0}, None]
+
+
+def test_segments_run_freely_when_budget_covers_worst_case():
+    async def run():
+        stub = StubLayer("l", probe_delay={"first": 0.05})
+        segments = ["first", "second"]
+        budget = JobBudget(2, segments=2, worst_case=2)
+        return await asyncio.gather(*classify_all(segments, [layer(stub)], budget))
+
+    assert asyncio.run(run()) == [
+        {"intent": "l:first", "confidence": 1.0},
+        {"intent": "l:second", "confidence": 1.0},
+    ]
+
+
+def test_failed_segment_does_not_block_later_ones():
+    async def run():
+        stub = StubLayer("l", fail_on={"first"})
+        segments = ["first", "second"]
+        budget = JobBudget(1, segments=2, worst_case=2)
+        return await asyncio.wait_for(
+            asyncio.gather(*classify_all(segments, [layer(stub)], budget), return_exceptions=True),
+            timeout=1,
+        )
+
+    first, second = asyncio.run(run())
+    assert isinstance(first, RuntimeError)
+    assert second == {"intent": "l:second", "confidence": 1.0}
+
+
+def test_cancelled_segment_does_not_block_later_ones():
+    async def run():
+        stub = StubLayer("l", probe_delay={"first": 10})
+        segments = ["first", "second"]
+        budget = JobBudget(1, segments=2, worst_case=2)
+        first, second = (asyncio.ensure_future(c) for c in classify_all(segments, [layer(stub)], budget))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await asyncio.wait_for(second, timeout=1)
+
+    assert asyncio.run(run()) == {"intent": "l:second", "confidence": 1.0}
+
+
+def test_speculative_classify_cancelled_once_higher_priority_answers():
+    async def run():
+        primary = StubLayer("primary")
+        speculative = StubLayer("speculative", classify_delay=10)
+        layers = [layer(primary), layer(speculative, speculative=True)]
+        # Started beforehand, so both are probed (and the speculative one classifies) right away
+        for item in layers:
+            await started_instance(item)
+
+        result = await classify_segment([], "segment", layers, JobBudget(10))
+        # The cancellation is delivered the next time the loop runs the speculative task
+        await asyncio.sleep(0)
+        return result, speculative
+
+    result, speculative = asyncio.run(run())
+    assert result == {"intent": "primary:segment", "confidence": 1.0}
+    assert speculative.classified == ["segment"]
+    assert speculative.cancelled
+
+
+def test_startup_restarted_on_new_event_loop():
+    class SlowStartLayer(StubLayer):
+        starts = 0
+
+        async def on_startup(self):
+            self.starts += 1
+            if self.starts == 1:
+                await asyncio.sleep(10)
+
+    item = layer(SlowStartLayer("l"))
+
+    async def begin_startup():
+        asyncio.ensure_future(started_instance(item))
+        await asyncio.sleep(0)
+
+    # The first loop stops while the startup is still pending, like a lifespan ending mid-startup
+    first_loop = asyncio.new_event_loop()
+    try:
+        first_loop.run_until_complete(begin_startup())
+        stale_startup = item["startup"][1]
+
+        instance = asyncio.run(started_instance(item))
+        assert instance.starts == 2
+    finally:
+        stale_startup.cancel()
+        first_loop.run_until_complete(asyncio.sleep(0))
+        first_loop.close()
+
+
+SEGMENTS = ("a", "b", "c", "d")
+
+
+def test_segment_prefix_matches_a_sliced_list():
+    prefix = SegmentPrefix(SEGMENTS, 3)
+    expected = list(SEGMENTS[:3])
+
+    assert len(prefix) == 3
+    assert list(prefix) == expected
+    assert [prefix[i] for i in range(-3, 3)] == [expected[i] for i in range(-3, 3)]
+    slices = (
+        slice(None),
+        slice(1, None),
+        slice(-2, None),
+        slice(None, -1),
+        slice(2, 10),
+        slice(-10, 1),
+        slice(None, None, -1),
+    )
+    for s in slices:
+        assert prefix[s] == expected[s]
+
+
+@pytest.mark.parametrize("index", [3, 4, -4, 100])
+def test_segment_prefix_out_of_range(index):
+    # Segments past the prefix exist in the shared tuple, they still must not be visible
+    with pytest.raises(IndexError):
+        SegmentPrefix(SEGMENTS, 3)[index]
+
+
+def test_empty_segment_prefix():
+    prefix = SegmentPrefix(SEGMENTS, 0)
+
+    assert len(prefix) == 0
+    assert list(prefix) == []
+    assert prefix[:] == []
+    with pytest.raises(IndexError):
+        prefix[0]
+    with pytest.raises(IndexError):
+        prefix[-1]